@@ -0,0 +1,139 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Global parameters
+AMORTIZATION_CACHE_SIZE = 128  # Maximum number of (amount, rate, term) schedules kept in memory
+
+def annuity_factors(monthly_interest_rates, months):
+    """
+    Calculates the annuity factor ((1 + r) ** k - 1) / r for every rate and month.
+
+    The power series is evaluated with expm1/log1p so that very small rates stay accurate,
+    and a zero rate falls back to the limit of the formula (k).
+
+    Args:
+        monthly_interest_rates (np.ndarray): Monthly interest rates (e.g. 0.055 / 12).
+        months (np.ndarray): Month numbers, broadcastable against the rates.
+
+    Returns:
+        np.ndarray: Annuity factors with the broadcast shape of the inputs.
+
+    Example:
+        >>> annuity_factors(np.array([0.0, 0.01]), np.array([12]))
+        array([12.        , 12.68250301])
+    """
+    rates = np.asarray(monthly_interest_rates, dtype=float)
+    months = np.asarray(months, dtype=float)
+    growth_minus_one = np.expm1(months * np.log1p(rates))
+    # np.divide with where= skips the zero rates, which keep the value of months
+    return np.divide(
+        growth_minus_one,
+        rates,
+        out=np.broadcast_to(months, growth_minus_one.shape).copy(),
+        where=rates != 0
+    )
+
+def calculate_amortization(loan_amounts, annual_interest_rates, loan_terms_years):
+    """
+    Calculates payment schedules for a batch of loan scenarios at once.
+
+    The balance after k payments is taken from the closed form
+    B_k = P + (P * r - M) * ((1 + r) ** k - 1) / r, so the whole schedule is computed
+    with NumPy array operations instead of a month-by-month loop.
+    Scenarios with shorter terms are padded with NaN up to the longest term.
+
+    Args:
+        loan_amounts (array-like): Loan amounts, one per scenario.
+        annual_interest_rates (array-like): Annual interest rates in % (e.g. 5.5), one per scenario.
+        loan_terms_years (array-like): Loan terms in years, one per scenario.
+
+    Returns:
+        dict: Schedules for all scenarios, containing:
+            - "Monthly Payment": 1D array (scenarios) with the fixed monthly payment.
+            - "Principal": 2D array (scenarios x months) with the principal part of each payment.
+            - "Interest": 2D array (scenarios x months) with the interest part of each payment.
+            - "Remaining Balance": 2D array (scenarios x months) with the balance after each payment.
+    """
+    loan_amounts = np.atleast_1d(np.asarray(loan_amounts, dtype=float))
+    monthly_interest_rates = np.atleast_1d(np.asarray(annual_interest_rates, dtype=float)) / 100 / 12
+    number_of_payments = np.atleast_1d(np.asarray(loan_terms_years, dtype=int)) * 12
+    loan_amounts, monthly_interest_rates, number_of_payments = np.broadcast_arrays(
+        loan_amounts, monthly_interest_rates, number_of_payments
+    )
+
+    # Fixed monthly payment M = P * (1 + r * A_n) / A_n (equals P / n for a zero rate)
+    total_factors = annuity_factors(monthly_interest_rates, number_of_payments)
+    monthly_payments = loan_amounts * (1 + monthly_interest_rates * total_factors) / total_factors
+
+    # Balances for months 0..n of every scenario (one row per scenario)
+    months = np.arange(number_of_payments.max() + 1)
+    factors = annuity_factors(monthly_interest_rates[:, None], months[None, :])
+    balances = loan_amounts[:, None] + (
+        loan_amounts * monthly_interest_rates - monthly_payments
+    )[:, None] * factors
+
+    interest = balances[:, :-1] * monthly_interest_rates[:, None]
+    principal = monthly_payments[:, None] - interest
+    remaining_balance = balances[:, 1:]
+
+    # Hide the months after the end of each loan term
+    past_term = months[None, 1:] > number_of_payments[:, None]
+    interest[past_term] = np.nan
+    principal[past_term] = np.nan
+    remaining_balance[past_term] = np.nan
+
+    return {
+        "Monthly Payment": monthly_payments,
+        "Principal": principal,
+        "Interest": interest,
+        "Remaining Balance": remaining_balance
+    }
+
+@lru_cache(maxsize=AMORTIZATION_CACHE_SIZE)
+def _cached_schedule(loan_amount, annual_interest_rate, loan_term_years):
+    """
+    Memoized single-scenario schedule. The arrays are made read-only because
+    the same objects are returned to every caller with the same arguments.
+    """
+    schedule = calculate_amortization(loan_amount, annual_interest_rate, loan_term_years)
+    result = {"Monthly Payment": float(schedule["Monthly Payment"][0])}
+    for name in ("Principal", "Interest", "Remaining Balance"):
+        values = schedule[name][0]  # Only one scenario
+        values.setflags(write=False)
+        result[name] = values
+    return result
+
+def amortization_schedule(loan_amount, annual_interest_rate, loan_term_years):
+    """
+    Returns the monthly payment schedule of a single loan.
+
+    Results are memoized on (loan_amount, annual_interest_rate, loan_term_years) in a
+    bounded LRU cache, so Streamlit reruns with unchanged inputs do not recompute it.
+
+    Args:
+        loan_amount (float): Loan amount (home value - deposit).
+        annual_interest_rate (float): Annual interest rate in % (e.g. 5.5).
+        loan_term_years (int): Loan term in years.
+
+    Returns:
+        tuple: (monthly_payment, schedule_df)
+            - monthly_payment (float): Fixed monthly payment.
+            - schedule_df (pd.DataFrame): One row per month with the columns
+              "Month", "Payment", "Principal", "Interest", "Remaining Balance", "Year".
+    """
+    schedule = _cached_schedule(float(loan_amount), float(annual_interest_rate), int(loan_term_years))
+    monthly_payment = schedule["Monthly Payment"]
+    months = np.arange(1, len(schedule["Principal"]) + 1)
+
+    schedule_df = pd.DataFrame({
+        "Month": months,
+        "Payment": monthly_payment,
+        "Principal": schedule["Principal"],
+        "Interest": schedule["Interest"],
+        "Remaining Balance": schedule["Remaining Balance"],
+        "Year": (months + 11) // 12  # Year into the loan (same as math.ceil(month / 12))
+    })
+
+    return monthly_payment, schedule_df
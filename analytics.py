@@ -0,0 +1,160 @@
+import os
+
+import pandas as pd
+
+# Global parameters
+ORDER_HISTORY_PATH = "order_history.csv"  # CSV file with the utilization of all saved orders
+
+# Columns of the material utilization table that can be summed over orders
+MATERIAL_SUM_COLUMNS = ["Sheets", "Sheet Weight (kg)", "Part Weight (kg)"]
+
+def add_utilization_ratios(utilization_df):
+    """
+    Calculates scrap weight and utilization from the summed weights.
+    Ratios are calculated after summing so they can be recalculated for any grouping.
+
+    Args:
+        utilization_df (pd.DataFrame): DataFrame with the MATERIAL_SUM_COLUMNS.
+
+    Returns:
+        pd.DataFrame: DataFrame with the columns "Scrap Weight (kg)" and "Weight Utilization (%)".
+    """
+    utilization_df["Scrap Weight (kg)"] = utilization_df["Sheet Weight (kg)"] - utilization_df["Part Weight (kg)"]
+    utilization_df["Weight Utilization (%)"] = round(
+        utilization_df["Part Weight (kg)"] / utilization_df["Sheet Weight (kg)"] * 100, 2
+    )
+
+    return utilization_df
+
+def calculate_material_utilization(sub_nests_df, parts_df):
+    """
+    Calculates sheet utilization per material and thickness.
+
+    Placed part weight (part weight * placed quantity) is compared to the weight of the
+    sheets used (sheet weight * sheet quantity). Both tables are grouped with pandas,
+    so no row-by-row loop is needed.
+    The reports do not say which parts are placed on which sheet, so utilization
+    is calculated per material and thickness, not per sheet.
+
+    Args:
+        sub_nests_df (pd.DataFrame): Sub nests in order.
+        parts_df (pd.DataFrame): Parts in order.
+
+    Returns:
+        pd.DataFrame: One row per material and thickness with the MATERIAL_SUM_COLUMNS,
+                      "Scrap Weight (kg)" and "Weight Utilization (%)".
+    """
+    group_columns = ["Material", "Thickness (mm)"]
+
+    sheets_df = pd.DataFrame({
+        "Material": sub_nests_df["Material"],
+        "Thickness (mm)": sub_nests_df["Thickness (mm)"],
+        "Sheets": sub_nests_df["Quantity"],
+        "Sheet Weight (kg)": sub_nests_df["Weight (kg)"] * sub_nests_df["Quantity"]
+    }).groupby(group_columns).sum()
+
+    part_weights = pd.DataFrame({
+        "Material": parts_df["Material"],
+        "Thickness (mm)": parts_df["Thickness (mm)"],
+        "Part Weight (kg)": parts_df["Weight (kg)"] * parts_df["Placed Qty"]
+    }).groupby(group_columns).sum()
+
+    utilization_df = sheets_df.join(part_weights, how="outer").fillna(0).reset_index()
+    return add_utilization_ratios(utilization_df)
+
+def add_sub_nest_utilization(sub_nests_df, material_utilization_df):
+    """
+    Adds utilization and scrap fields to the priced Sub Nests DataFrame.
+
+    The reports do not say which parts are placed on which sheet, so every sub nest
+    gets the weight utilization of its material and thickness. Its scrap weight and
+    scrap material price then show which nests waste the most material.
+    "Total Weight (kg)" already holds the sheet weight of the sub nest.
+
+    Args:
+        sub_nests_df (pd.DataFrame): Sub nests with the "Total Weight (kg)" and
+                                     "Total Material Price (€)" columns.
+        material_utilization_df (pd.DataFrame): Result of calculate_material_utilization().
+
+    Returns:
+        pd.DataFrame: DataFrame with the columns "Weight Utilization (%)", "Scrap Weight (kg)"
+                      and "Scrap Material Price (€)".
+    """
+    group_columns = ["Material", "Thickness (mm)"]
+
+    # Look up the utilization of each sub nest's material and thickness (keeps the row order)
+    utilization = sub_nests_df[group_columns].merge(
+        material_utilization_df[group_columns + ["Weight Utilization (%)"]],
+        on=group_columns,
+        how="left"
+    )["Weight Utilization (%)"].to_numpy()
+    scrap_ratio = 1 - utilization / 100
+
+    sub_nests_df["Weight Utilization (%)"] = utilization
+    sub_nests_df["Scrap Weight (kg)"] = round(sub_nests_df["Total Weight (kg)"] * scrap_ratio, 3)
+    sub_nests_df["Scrap Material Price (€)"] = round(sub_nests_df["Total Material Price (€)"] * scrap_ratio, 2)
+
+    return sub_nests_df
+
+def read_order_history(history_path=ORDER_HISTORY_PATH):
+    """
+    Reads the saved order history.
+
+    Args:
+        history_path (str): Path of the history CSV file.
+
+    Returns:
+        pd.DataFrame: Saved rows of all orders. Empty if there is no history.
+    """
+    if not os.path.exists(history_path):
+        return pd.DataFrame()
+
+    # Order ids are entered as text, read them as text even if they only contain digits
+    return pd.read_csv(history_path, dtype={"Order": str})
+
+def save_order_utilization(material_utilization_df, order_id, history_path=ORDER_HISTORY_PATH):
+    """
+    Saves the material utilization of an order to the order history.
+
+    Only the summed columns are stored, so the history can be aggregated later
+    without parsing the reports again. Rows already saved for the same order
+    are replaced, so saving an order again does not count it twice.
+
+    Args:
+        material_utilization_df (pd.DataFrame): Result of calculate_material_utilization().
+        order_id (str): Identifier of the order entered by the estimator (e.g. the quote number).
+                        All revisions of an order must be saved with the same id.
+        history_path (str): Path of the history CSV file.
+    """
+    order_df = material_utilization_df[["Material", "Thickness (mm)"] + MATERIAL_SUM_COLUMNS].copy()
+    order_df.insert(0, "Order", order_id)
+    order_df.insert(1, "Saved At", pd.Timestamp.now().isoformat(timespec="seconds"))
+
+    history_df = read_order_history(history_path)
+    if not history_df.empty:
+        history_df = history_df[history_df["Order"] != order_id]
+        order_df = pd.concat([history_df, order_df], ignore_index=True)
+
+    order_df.to_csv(history_path, index=False)
+
+def aggregate_order_history(history_path=ORDER_HISTORY_PATH, group_columns=("Material", "Thickness (mm)")):
+    """
+    Aggregates the utilization of all saved orders.
+
+    Args:
+        history_path (str): Path of the history CSV file.
+        group_columns (tuple[str]): Columns to group by, e.g. ("Material",) or ("Order",)
+                                    to find orders with the most scrap.
+
+    Returns:
+        pd.DataFrame: Summed weights with recalculated utilization per group,
+                      sorted by the lowest weight utilization. Empty if there is no history.
+    """
+    history_df = read_order_history(history_path)
+    if history_df.empty:
+        return history_df
+
+    aggregated_df = history_df.groupby(list(group_columns))[MATERIAL_SUM_COLUMNS].sum().reset_index()
+    aggregated_df = add_utilization_ratios(aggregated_df)
+
+    return aggregated_df.sort_values("Weight Utilization (%)").reset_index(drop=True)
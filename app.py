@@ -1,10 +1,13 @@
 import streamlit as st
 import pandas as pd
 import json # Added for debugging
-from parsers import parse_sub_nests, parse_parts, parse_multiple_reports
+from parsers import parse_sub_nests, parse_parts
 from calculations import calculate_sub_nests, calculate_parts, calculate_order, MissingMaterialPriceError
-from ui_components import display_table, display_summary
+from ui_components import display_table, display_summary, display_price_delta
 from api_utils import submit_prices_to_bubble
+from durations import format_hhmmss, InvalidDurationError
+from revisions import build_revision, is_same_order, price_revision, price_delta
+from analytics import save_order_utilization
 
 # Streamlit configuration
 st.set_page_config(page_title="Hinnakalkulaator", page_icon=":moneybag:", layout="wide")
@@ -15,6 +18,11 @@ if "sub_nests_df" not in st.session_state:
     st.session_state.sub_nests_df = None
 if "parts_df" not in st.session_state:
     st.session_state.parts_df = None
+# Last processed revision of the order, used to reprice only changed rows when reports are resent
+if "revision" not in st.session_state:
+    st.session_state.revision = None
+if "material_utilization_df" not in st.session_state:
+    st.session_state.material_utilization_df = None
 
 # Title
 st.title("Hinnakalkulaator")
@@ -50,13 +58,21 @@ with st.sidebar:
         format="%.3f"  # Format to always show 3 decimal places
     )
 
+    # Merge identical parts and sub nests from all reports before pricing and submitting
+    consolidate_identical_rows = st.checkbox(
+        "Consolidate identical parts and sub nests",
+        value=False,
+        help="Parts with the same name, material, thickness, weight and cutting time and sub nests with the same sheet size, "
+             "material, thickness, area, weight and cutting time are merged into one row with summed quantities."
+    )
+
 # Upload multiple reports
 # Returns a list of file objects - accept any file type and validate later
 uploaded_files = st.file_uploader("Upload Metallix AutoNest reports", accept_multiple_files=True)
 
 if uploaded_files:
     # Read the content of each uploaded file
-    file_contents = [] # List to store the content (as strings) of all uploaded files
+    file_contents = [] # List to store the (file name, content as string) of all uploaded files
     for file in uploaded_files: # file is a file object
         # Check if file has a valid extension
         file_name = file.name.lower()
@@ -66,7 +82,7 @@ if uploaded_files:
         # Read and decode the file content
         try:
             content = file.read().decode("utf-8")
-            file_contents.append(content)
+            file_contents.append((file.name, content)) # The file name identifies the report in the next revision
             
             # Display the file name and preview content in an expandable section
             with st.expander(f"Preview: {file.name}"):
@@ -83,14 +99,22 @@ if st.button("Process Files"):
         st.write("Processing uploaded reports...")
 
         try:
-            # Parse and calculate combined data
-            combined_data = parse_multiple_reports(file_contents)
+            # Parse the reports into a new revision of the order
+            # Reports that did not change since the previous revision are not parsed again,
+            # resent reports (same file name) are compared row by row
+            # consolidate merges identical rows so they are priced and submitted to Bubble only once
+            previous_revision = st.session_state.revision
+            revision = build_revision(file_contents, previous_revision, consolidate=consolidate_identical_rows)
             # material_prices is a dictionary contains the material names as keys and their corresponding user-specified prices 
             # (from the sidebar input) as values.
-            results = calculate_order(combined_data, material_prices, cutting_price_per_sec)        
+            # Only rows that were added or changed since the previous revision are priced again
+            results = price_revision(revision, material_prices, cutting_price_per_sec, previous_revision)
         except MissingMaterialPriceError as e:
             st.error(str(e))  # Display a specific message for missing material prices
             st.stop()  # Gracefully halt execution
+        except InvalidDurationError as e:
+            st.error(str(e))  # Display the malformed cutting time from the report
+            st.stop()
         except Exception as e:
             st.error(f"An unexpected error occurred: {e}")  # Catch any other unexpected error
             st.stop()
@@ -103,6 +127,13 @@ if st.button("Process Files"):
         # is not executed again
         st.session_state.sub_nests_df = results["sub_nests_with_calcs_df"] # DataFrame
         st.session_state.parts_df = results["parts_with_calcs_df"] # DataFrame
+        st.session_state.material_utilization_df = results["material_utilization_df"] # DataFrame
+        st.session_state.revision = revision
+
+        # Show the price delta if this is a new revision of the same order (at least one report file name is resent)
+        if previous_revision is not None and is_same_order(previous_revision, revision):
+            delta_df, delta_totals = price_delta(previous_revision, revision)
+            display_price_delta(delta_df, delta_totals)
 
         # ===== Display Results =====
         st.subheader("Sub Nests in Order")
@@ -114,7 +145,8 @@ if st.button("Process Files"):
                  [
                      "Sheet Size X (mm)", "Sheet Size Y (mm)", "Material", "Thickness (mm)", 
                      "Quantity", "Weight (kg)", "Total Weight (kg)", "Total Material Price (€)", 
-                     "Total Cutting Time (sec)", "Total Cutting Price (€)", "Total Price (€)"
+                     "Total Cutting Time (sec)", "Total Cutting Price (€)", "Total Price (€)",
+                     "Weight Utilization (%)", "Scrap Weight (kg)", "Scrap Material Price (€)"
                  ]
             ], 
             hide_index=False,                 
@@ -126,7 +158,7 @@ if st.button("Process Files"):
         total_material_price = st.session_state.sub_nests_df["Total Material Price (€)"].sum()
         total_cutting_time_sec = st.session_state.sub_nests_df["Total Cutting Time (sec)"].sum()
         # Convert cutting time to HH:MM:SS format
-        total_cutting_time_hms = f"{total_cutting_time_sec // 3600:02}:{(total_cutting_time_sec % 3600) // 60:02}:{total_cutting_time_sec % 60:02}"
+        total_cutting_time_hms = format_hhmmss(total_cutting_time_sec)
         total_cutting_price = st.session_state.sub_nests_df["Total Cutting Price (€)"].sum()
         total_price_sub_nests = st.session_state.sub_nests_df["Total Price (€)"].sum()
         
@@ -144,6 +176,15 @@ if st.button("Process Files"):
         st.markdown(f"**Total Cutting Price:** €{total_cutting_price:.2f}")
         st.markdown(f"<h3 style='color:green;'>Total Price: €{total_price_sub_nests:.2f}</h3>", unsafe_allow_html=True)
 
+        # Sheet utilization per material and thickness (placed part weight vs sheet weight)
+        display_table(st.session_state.material_utilization_df, "Sheet Utilization by Material")
+        st.caption(
+            "Utilization compares the weight of the placed parts with the weight of the sheets. "
+            "The reports do not say which parts are placed on which sheet, so the scrap of each sub nest "
+            "is estimated from the utilization of its material and thickness. "
+            "Area usage is not shown because the Area in the reports is the area of the whole sheet."
+        )
+
         # Combined Parts Summary
         total_price_parts = st.session_state.parts_df["Total Price (€)"].sum()
 
@@ -181,4 +222,17 @@ if st.button("Submit Prices"):
         if success:
             st.success(message)
         else:
-            st.error(message)
\ No newline at end of file
+            st.error(message)
+
+# ===== Save sheet utilization to the order history =====
+# The order id (e.g. the quote number) must be the same for all revisions of an order,
+# saving a revision replaces the utilization saved earlier for that order
+order_id = st.text_input("Order ID (e.g. quote number)").strip()
+if st.button("Save Utilization to History"):
+    if st.session_state.material_utilization_df is None:
+        st.error("Please process the files first before saving utilization.")
+    elif not order_id:
+        st.error("Please enter the order ID before saving utilization.")
+    else:
+        save_order_utilization(st.session_state.material_utilization_df, order_id)
+        st.success(f"Utilization of order {order_id} saved to history")
@@ -0,0 +1,78 @@
+"""
+Benchmark of the vectorized amortization engine against the original month-by-month loop.
+
+Run:
+    python bench_amortization.py
+"""
+import math
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from amortization import amortization_schedule, calculate_amortization, _cached_schedule
+
+LOAN_TERM_YEARS = 40  # Longest term offered in the mortgage calculator
+NUMBER_OF_SCENARIOS = 5000
+
+def loop_schedule(loan_amount, interest_rate, loan_term):
+    """
+    Original schedule from mortgage_calculator.py (one Python iteration per month).
+    """
+    monthly_interest_rate = (interest_rate / 100) / 12
+    number_of_payments = loan_term * 12
+    monthly_payment = (
+        loan_amount
+        * (monthly_interest_rate * (1 + monthly_interest_rate) ** number_of_payments)
+        / ((1 + monthly_interest_rate) ** number_of_payments - 1)
+    )
+
+    schedule = []
+    remaining_balance = loan_amount
+    for i in range(1, number_of_payments + 1):
+        interest_payment = remaining_balance * monthly_interest_rate
+        principal_payment = monthly_payment - interest_payment
+        remaining_balance -= principal_payment
+        year = math.ceil(i / 12)
+        schedule.append([i, monthly_payment, principal_payment, interest_payment, remaining_balance, year])
+
+    return pd.DataFrame(
+        schedule,
+        columns=["Month", "Payment", "Principal", "Interest", "Remaining Balance", "Year"],
+    )
+
+def main():
+    rng = np.random.default_rng(0)
+    loan_amounts = rng.uniform(50_000, 1_000_000, NUMBER_OF_SCENARIOS)
+    interest_rates = rng.uniform(0.5, 12.0, NUMBER_OF_SCENARIOS)
+    loan_terms = np.full(NUMBER_OF_SCENARIOS, LOAN_TERM_YEARS)
+
+    # Both versions must produce the same schedule
+    expected_df = loop_schedule(400_000, 5.5, LOAN_TERM_YEARS)
+    _, schedule_df = amortization_schedule(400_000, 5.5, LOAN_TERM_YEARS)
+    for column in ("Principal", "Interest", "Remaining Balance"):
+        np.testing.assert_allclose(schedule_df[column], expected_df[column], rtol=1e-9, atol=1e-6)
+    assert (schedule_df["Year"] == expected_df["Year"]).all()
+
+    # Single 40-year schedule
+    loop_time = min(timeit.repeat(lambda: loop_schedule(400_000, 5.5, LOAN_TERM_YEARS), number=20, repeat=5)) / 20
+    def uncached():
+        _cached_schedule.cache_clear()
+        amortization_schedule(400_000, 5.5, LOAN_TERM_YEARS)
+    vectorized_time = min(timeit.repeat(uncached, number=20, repeat=5)) / 20
+    cached_time = min(timeit.repeat(lambda: amortization_schedule(400_000, 5.5, LOAN_TERM_YEARS), number=20, repeat=5)) / 20
+    print(f"Single {LOAN_TERM_YEARS}-year schedule:")
+    print(f"  loop:       {loop_time * 1000:8.3f} ms")
+    print(f"  vectorized: {vectorized_time * 1000:8.3f} ms ({loop_time / vectorized_time:.1f}x)")
+    print(f"  cached:     {cached_time * 1000:8.3f} ms ({loop_time / cached_time:.1f}x)")
+
+    # Batch of scenarios
+    scenarios = list(zip(loan_amounts, interest_rates, loan_terms))
+    loop_time = min(timeit.repeat(lambda: [loop_schedule(*scenario) for scenario in scenarios], number=1, repeat=3))
+    batch_time = min(timeit.repeat(lambda: calculate_amortization(loan_amounts, interest_rates, loan_terms), number=1, repeat=3))
+    print(f"{NUMBER_OF_SCENARIOS} scenarios x {LOAN_TERM_YEARS} years:")
+    print(f"  loop:       {loop_time * 1000:8.1f} ms")
+    print(f"  vectorized: {batch_time * 1000:8.1f} ms ({loop_time / batch_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
+import numpy as np
 import pandas as pd
+from durations import parse_hhmmss, parse_hhmmss_array
+from analytics import calculate_material_utilization, add_sub_nest_utilization
 
 # Global parameters
 MIN_CUT_TIME_PER_SHEET_SEC = 900  # Minimum cutting time in seconds per 1 sheet (15 minutes)
@@ -16,33 +19,37 @@ def convert_hhmmss_to_seconds(time_str):
     
     Returns:
         int: Total number of seconds
+
+    Raises:
+        InvalidDurationError: If the value is not a valid duration (see durations.parse_hhmmss).
         
     Example:
-        >>> convert_hhmmss_to_seconds("00:15:30")
-        930  # (15 minutes * 60) + 30 seconds
+        >>> convert_hhmmss_to_seconds("00:15:30")  # (15 minutes * 60) + 30 seconds
+        930
     """
-    return sum(int(t) * 60 ** i for i, t in enumerate(reversed(time_str.split(":"))))
+    return parse_hhmmss(time_str)
 
 def apply_minimum_cutting_time(cutting_time_sec):
     """
     Apply minimum cutting time threshold to a given cutting time per sheet.
     If the input time is less than MIN_CUT_TIME_PER_SHEET_SEC (900 seconds/15 minutes),
     return MIN_CUT_TIME_PER_SHEET_SEC instead.
+    Works for a single value or a whole column (e.g. an array from parse_hhmmss_array).
     
     Args:
-        cutting_time_sec (int): Original cutting time in seconds for one sheet
+        cutting_time_sec (int or np.ndarray): Original cutting time in seconds for one sheet
     
     Returns:
-        int: Either the original cutting time or MIN_CUT_TIME_PER_SHEET_SEC,
-             whichever is larger
+        int or np.ndarray: Either the original cutting time or MIN_CUT_TIME_PER_SHEET_SEC,
+                           whichever is larger
     
     Example:
-        >>> apply_minimum_cutting_time(600)  # 10 minutes
-        900  # Returns minimum threshold of 15 minutes
-        >>> apply_minimum_cutting_time(1200)  # 20 minutes
-        1200  # Returns original time as it's above threshold
+        >>> int(apply_minimum_cutting_time(600))  # 10 minutes, returns minimum threshold of 15 minutes
+        900
+        >>> int(apply_minimum_cutting_time(1200))  # 20 minutes, returns original time as it's above threshold
+        1200
     """
-    return max(cutting_time_sec, MIN_CUT_TIME_PER_SHEET_SEC)
+    return np.maximum(cutting_time_sec, MIN_CUT_TIME_PER_SHEET_SEC)
 
 def calculate_sub_nests(sub_nests_df, mat_price_per_kg, cutting_price_per_sec):
     """
@@ -56,9 +63,7 @@ def calculate_sub_nests(sub_nests_df, mat_price_per_kg, cutting_price_per_sec):
         pd.DataFrame: DataFrame with calculated columns.
     """
     sub_nests_df["Total Weight (kg)"] = sub_nests_df["Weight (kg)"] * sub_nests_df["Quantity"]
-    sub_nests_df["Cutting Time (sec / sheet)"] = sub_nests_df["Cutting Time (1 sheet)"].apply(
-        lambda x: sum(int(t) * 60 ** i for i, t in enumerate(reversed(x.split(":"))))
-    )
+    sub_nests_df["Cutting Time (sec / sheet)"] = parse_hhmmss_array(sub_nests_df["Cutting Time (1 sheet)"])
     sub_nests_df["Total Cutting Time (sec)"] = sub_nests_df["Cutting Time (sec / sheet)"] * sub_nests_df["Quantity"]
     sub_nests_df["Total Material Price (€)"] = sub_nests_df["Total Weight (kg)"] * mat_price_per_kg
     sub_nests_df["Total Cutting Price (€)"] = sub_nests_df["Total Cutting Time (sec)"] * cutting_price_per_sec
@@ -86,38 +91,38 @@ def calculate_parts(parts_df, mat_price_per_kg, cutting_price_per_sec):
     
     return parts_df
 
-def calculate_order(combined_data, material_prices, cutting_price_per_sec):
+def check_material_prices(materials, material_prices):
     """
-    Calculates prices for all sub nests and parts in the combined data from multiple reports.
+    Checks that a price is specified for every material.
 
     Args:
-        combined_data (dict): Combined data from multiple reports, containing:
-            - "sub_nests": List of sub-nests across all reports.
-            - "parts": List of parts across all reports.
+        materials (iterable): Material names used in the order (e.g. sub_nests_df["Material"]).
         material_prices (dict): Material prices per kilogram for each material name.
-        cutting_price_per_sec (float): Cutting price per second (single value).
 
-    Returns:
-        dict: Combined results for sub nests and parts, containing:
-            - "sub_nests_with_calcs_df": DataFrame with calculated fields for sub nests.
-            - "parts_with_calcs_df": DataFrame with calculated fields for parts.
+    Raises:
+        MissingMaterialPriceError: If a material has no price.
     """
-    # Convert combined data to DataFrames
-    sub_nests_df = pd.DataFrame(combined_data["sub_nests"])
-    parts_df = pd.DataFrame(combined_data["parts"])
-
-    # Check for missing materials in the material_prices dictionary
-    missing_materials = set(sub_nests_df["Material"]) - set(material_prices.keys())
+    missing_materials = set(materials) - set(material_prices.keys())
     if missing_materials:
         # Convert the set of missing materials to a comma-separated string and raise a custom exception
         raise MissingMaterialPriceError(f"Missing prices for materials: {', '.join(missing_materials)}")
 
-    # ===== Sub Nests Calculations =====
+def price_sub_nests(sub_nests_df, material_prices, cutting_price_per_sec):
+    """
+    Adds calculated price fields to the Sub Nests DataFrame using material-specific prices.
+    Args:
+        sub_nests_df (pd.DataFrame): DataFrame containing parsed sub nest data (at least one row).
+        material_prices (dict): Material prices per kilogram for each material name.
+        cutting_price_per_sec (float): Cutting price per second (single value).
+
+    Returns:
+        pd.DataFrame: DataFrame with calculated columns.
+    """
     sub_nests_df["Total Weight (kg)"] = sub_nests_df["Weight (kg)"] * sub_nests_df["Quantity"]
     
-    # Convert Cutting Time (HH:MM:SS) to seconds and apply minimum threshold
-    sub_nests_df["Cutting Time (sec / sheet)"] = sub_nests_df["Cutting Time (1 sheet)"].apply(
-        lambda x: apply_minimum_cutting_time(convert_hhmmss_to_seconds(x))
+    # Convert Cutting Time (HH:MM:SS) to seconds for the whole column and apply minimum threshold
+    sub_nests_df["Cutting Time (sec / sheet)"] = apply_minimum_cutting_time(
+        parse_hhmmss_array(sub_nests_df["Cutting Time (1 sheet)"])
     )
     sub_nests_df["Total Cutting Time (sec)"] = sub_nests_df["Cutting Time (sec / sheet)"] * sub_nests_df["Quantity"]
     
@@ -136,7 +141,19 @@ def calculate_order(combined_data, material_prices, cutting_price_per_sec):
     # Total Price for Sub Nests
     sub_nests_df["Total Price (€)"] = sub_nests_df["Total Material Price (€)"] + sub_nests_df["Total Cutting Price (€)"]
 
-    # ===== Parts Calculations =====
+    return sub_nests_df
+
+def price_parts(parts_df, material_prices, cutting_price_per_sec):
+    """
+    Adds calculated price fields to the Parts DataFrame using material-specific prices.
+    Args:
+        parts_df (pd.DataFrame): DataFrame containing parsed parts data (at least one row).
+        material_prices (dict): Material prices per kilogram for each material name.
+        cutting_price_per_sec (float): Cutting price per second (single value).
+
+    Returns:
+        pd.DataFrame: DataFrame with calculated columns.
+    """
     parts_df["Price per Part (€)"] = (
         parts_df.apply(
             lambda row: (
@@ -150,9 +167,46 @@ def calculate_order(combined_data, material_prices, cutting_price_per_sec):
     # Calcualte total price for all theses parts
     parts_df["Total Price (€)"] = round(parts_df["Price per Part (€)"] * parts_df["Ordered Qty"], 2)
 
+    return parts_df
+
+def calculate_order(combined_data, material_prices, cutting_price_per_sec):
+    """
+    Calculates prices for all sub nests and parts in the combined data from multiple reports.
+
+    Args:
+        combined_data (dict): Combined data from multiple reports, containing:
+            - "sub_nests": List of sub-nests across all reports.
+            - "parts": List of parts across all reports.
+        material_prices (dict): Material prices per kilogram for each material name.
+        cutting_price_per_sec (float): Cutting price per second (single value).
+
+    Returns:
+        dict: Combined results for sub nests and parts, containing:
+            - "sub_nests_with_calcs_df": DataFrame with calculated fields for sub nests.
+            - "parts_with_calcs_df": DataFrame with calculated fields for parts.
+            - "material_utilization_df": DataFrame with sheet utilization per material and thickness.
+    """
+    # Convert combined data to DataFrames
+    sub_nests_df = pd.DataFrame(combined_data["sub_nests"])
+    parts_df = pd.DataFrame(combined_data["parts"])
+
+    # Check for missing materials in the material_prices dictionary
+    check_material_prices(sub_nests_df["Material"], material_prices)
+
+    # ===== Sub Nests Calculations =====
+    sub_nests_df = price_sub_nests(sub_nests_df, material_prices, cutting_price_per_sec)
+
+    # ===== Parts Calculations =====
+    parts_df = price_parts(parts_df, material_prices, cutting_price_per_sec)
+
+    # ===== Sheet Utilization =====
+    material_utilization_df = calculate_material_utilization(sub_nests_df, parts_df)
+    sub_nests_df = add_sub_nest_utilization(sub_nests_df, material_utilization_df)
+
     # Return results
     return {
         "sub_nests_with_calcs_df": sub_nests_df,
-        "parts_with_calcs_df": parts_df
+        "parts_with_calcs_df": parts_df,
+        "material_utilization_df": material_utilization_df
     }
 
@@ -0,0 +1,146 @@
+import numpy as np
+
+# Lookup tables for fixed-width "HH:MM:SS" fields (two digits each)
+# e.g. _HOURS_TO_SECONDS["01"] = 3600, _MINUTES_TO_SECONDS["15"] = 900, _SECONDS["30"] = 30
+_HOURS_TO_SECONDS = {f"{i:02}": i * 3600 for i in range(100)}
+_MINUTES_TO_SECONDS = {f"{i:02}": i * 60 for i in range(60)}
+_SECONDS = {f"{i:02}": i for i in range(60)}
+
+# The same tables indexed by the numeric two-digit value for the vectorized parser
+# Minutes and seconds above 59 are marked as invalid (-1)
+_HOURS_TO_SECONDS_ARRAY = np.arange(100, dtype=np.int64) * 3600
+_MINUTES_TO_SECONDS_ARRAY = np.where(np.arange(100) < 60, np.arange(100, dtype=np.int64) * 60, -1)
+_SECONDS_ARRAY = np.where(np.arange(100) < 60, np.arange(100, dtype=np.int64), -1)
+
+# Two-digit strings for formatting minutes and seconds back to HH:MM:SS
+_TWO_DIGIT_STRINGS = [f"{i:02}" for i in range(60)]
+
+_DIGIT_ZERO = ord("0")
+_COLON = ord(":")
+
+class InvalidDurationError(ValueError):
+    """Custom exception for cutting times that are not in HH:MM:SS format."""
+    pass
+
+def _parse_variable_width(time_str):
+    """
+    Parses durations that are not fixed-width HH:MM:SS (e.g. "123:00:00" or "5:30")
+    and raises InvalidDurationError for malformed values.
+    """
+    fields = str(time_str).strip().split(":")
+    if len(fields) > 3 or not all(field.isascii() and field.isdigit() for field in fields):
+        raise InvalidDurationError(f"Invalid cutting time '{time_str}', expected HH:MM:SS")
+
+    values = [int(field) for field in fields]
+    # Only the leading field (hours, or minutes for MM:SS) may be above 59
+    if any(value >= 60 for value in values[1:]):
+        raise InvalidDurationError(f"Invalid cutting time '{time_str}', minutes and seconds must be below 60")
+
+    total_seconds = 0
+    for value in values:
+        total_seconds = total_seconds * 60 + value
+    return total_seconds
+
+def parse_hhmmss(time_str):
+    """
+    Converts a time string in HH:MM:SS format to total seconds.
+
+    Fixed-width values are converted with precomputed two-digit lookup tables,
+    other values (e.g. more than 99 hours) are split and validated field by field.
+
+    Args:
+        time_str (str): Time string in format "HH:MM:SS" (e.g., "00:15:30")
+
+    Returns:
+        int: Total number of seconds
+
+    Raises:
+        InvalidDurationError: If the value is not a valid duration.
+
+    Example:
+        >>> parse_hhmmss("00:15:30")
+        930
+        >>> parse_hhmmss("00:75:00")
+        Traceback (most recent call last):
+        ...
+        durations.InvalidDurationError: Invalid cutting time '00:75:00', minutes and seconds must be below 60
+    """
+    if len(time_str) == 8 and time_str[2] == ":" and time_str[5] == ":":
+        hours = _HOURS_TO_SECONDS.get(time_str[0:2])
+        minutes = _MINUTES_TO_SECONDS.get(time_str[3:5])
+        seconds = _SECONDS.get(time_str[6:8])
+        if hours is not None and minutes is not None and seconds is not None:
+            return hours + minutes + seconds
+
+    return _parse_variable_width(time_str)
+
+def parse_hhmmss_array(time_strs):
+    """
+    Converts a whole column of HH:MM:SS time strings to total seconds.
+
+    Fixed-width values are decoded at once from their character codes with NumPy
+    and the two-digit lookup tables. Only values that are not fixed-width fall back
+    to parse_hhmmss().
+
+    Args:
+        time_strs (array-like): Time strings, e.g. sub_nests_df["Cutting Time (1 sheet)"].
+
+    Returns:
+        np.ndarray: Total number of seconds for each value (int64).
+
+    Raises:
+        InvalidDurationError: If any value is not a valid duration.
+
+    Example:
+        >>> parse_hhmmss_array(["00:48:08", "01:00:00", "100:00:00"])
+        array([  2888,   3600, 360000])
+    """
+    values = np.asarray(time_strs, dtype=str)
+    total_seconds = np.zeros(values.shape, dtype=np.int64)
+    if values.size == 0:
+        return total_seconds
+
+    # Character codes of the first 8 characters of every value (one row per value)
+    codes = values.astype("U8").view(np.uint32).reshape(len(values), 8).astype(np.int64)
+    digits = codes - _DIGIT_ZERO
+
+    digit_columns = [0, 1, 3, 4, 6, 7]
+    is_fixed_width = (
+        (np.char.str_len(values) == 8)
+        & (codes[:, 2] == _COLON)
+        & (codes[:, 5] == _COLON)
+        & ((digits[:, digit_columns] >= 0) & (digits[:, digit_columns] <= 9)).all(axis=1)
+    )
+
+    # Two-digit values (0..99) of each field, invalid rows are clipped to a safe index
+    fields = np.clip(digits[:, 0::3] * 10 + digits[:, 1::3], 0, 99)
+    hours = _HOURS_TO_SECONDS_ARRAY[fields[:, 0]]
+    minutes = _MINUTES_TO_SECONDS_ARRAY[fields[:, 1]]
+    seconds = _SECONDS_ARRAY[fields[:, 2]]
+    is_fixed_width &= (minutes >= 0) & (seconds >= 0)
+
+    total_seconds[is_fixed_width] = (hours + minutes + seconds)[is_fixed_width]
+
+    # Variable-width or malformed values are parsed (and validated) one by one
+    for index in np.flatnonzero(~is_fixed_width):
+        total_seconds[index] = _parse_variable_width(values[index])
+
+    return total_seconds
+
+def format_hhmmss(total_seconds):
+    """
+    Converts total seconds to a time string in HH:MM:SS format.
+
+    Args:
+        total_seconds (int): Total number of seconds (e.g. the sum of a cutting time column).
+
+    Returns:
+        str: Time string in format "HH:MM:SS" (hours may exceed 99)
+
+    Example:
+        >>> format_hhmmss(930)
+        '00:15:30'
+    """
+    minutes, seconds = divmod(int(total_seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{_TWO_DIGIT_STRINGS[minutes]}:{_TWO_DIGIT_STRINGS[seconds]}"
@@ -1,6 +1,5 @@
 import streamlit as st
-import pandas as pd
-import math
+from amortization import amortization_schedule
 
 st.title("Mortgage Repayments Calculator")
 
@@ -12,14 +11,10 @@ interest_rate = col2.number_input("Interest Rate (in %)", min_value=0.0, value=5
 loan_term = col2.number_input("Loan Term (in years)", min_value=1, value=30)
 
 # Calculate the repayments.
+# The schedule is memoized on (amount, rate, term), so reruns with unchanged inputs are not recomputed
 loan_amount = home_value - deposit
-monthly_interest_rate = (interest_rate / 100) / 12
 number_of_payments = loan_term * 12
-monthly_payment = (
-    loan_amount
-    * (monthly_interest_rate * (1 + monthly_interest_rate) ** number_of_payments)
-    / ((1 + monthly_interest_rate) ** number_of_payments - 1)
-)
+monthly_payment, df = amortization_schedule(loan_amount, interest_rate, loan_term)
 
 # Display the repayments.
 total_payments = monthly_payment * number_of_payments
@@ -31,31 +26,6 @@ col1.metric(label="Monthly Repayments", value=f"${monthly_payment:,.2f}")
 col2.metric(label="Total Repayments", value=f"${total_payments:,.0f}")
 col3.metric(label="Total Interest", value=f"${total_interest:,.0f}")
 
-# Create a data-frame with the payment schedule.
-schedule = []
-remaining_balance = loan_amount
-
-for i in range(1, number_of_payments + 1):
-    interest_payment = remaining_balance * monthly_interest_rate
-    principal_payment = monthly_payment - interest_payment
-    remaining_balance -= principal_payment
-    year = math.ceil(i / 12)  # Calculate the year into the loan
-    schedule.append(
-        [
-            i,
-            monthly_payment,
-            principal_payment,
-            interest_payment,
-            remaining_balance,
-            year,
-        ]
-    )
-
-df = pd.DataFrame(
-    schedule,
-    columns=["Month", "Payment", "Principal", "Interest", "Remaining Balance", "Year"],
-)
-
 # Display the data-frame as a chart.
 st.write("### Payment Schedule")
 payments_df = df[["Year", "Remaining Balance"]].groupby("Year").min()
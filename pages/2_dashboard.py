@@ -1,3 +1,13 @@
 import streamlit as st
+from analytics import aggregate_order_history
+from ui_components import display_table
 
 st.write("# Dashboard")
+
+# Sheet utilization aggregated over all saved orders (no reports are parsed again)
+material_history_df = aggregate_order_history()
+if material_history_df.empty:
+    st.info("No saved orders yet. Process reports and click 'Save Utilization to History' on the main page.")
+else:
+    display_table(material_history_df, "Sheet Utilization by Material")
+    display_table(aggregate_order_history(group_columns=("Order",)), "Sheet Utilization by Order")
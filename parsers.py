@@ -1,4 +1,5 @@
 import re # Regular expression library
+from durations import parse_hhmmss
 
 def parse_sub_nests(file_content):
     """
@@ -85,6 +86,7 @@ def parse_parts(file_content, material, thickness):
                     in the 'Parts in Order' table with the following keys:
                     - Part Name: The extracted part name from the full file path
                     - Ordered Qty: The number of parts ordered
+                    - Placed Qty: The number of parts placed on the sheets
                     - Weight (kg): The weight of a single part in kilograms
                     - Cutting Time (sec): The time to cut a single part in seconds
                     - Material: The material type for the part (e.g., "Mild Steel")
@@ -119,14 +121,16 @@ def parse_parts(file_content, material, thickness):
 
         # Convert data types
         ordered_qty = int(ordered_qty)
+        placed_qty = int(placed_qty)
         weight = float(weight)
         # Convert cutting time (HH:MM:SS) to seconds
-        cutting_time_sec = sum(int(x) * 60 ** i for i, x in enumerate(reversed(cutting_time.split(":"))))
+        cutting_time_sec = parse_hhmmss(cutting_time)
 
         # Add the parsed data to the list
         parts_data.append({
             "Part Name": part_name,
             "Ordered Qty": ordered_qty,
+            "Placed Qty": placed_qty,
             "Weight (kg)": weight,
             "Cutting Time (sec)": cutting_time_sec,
             "Material": material,  # Assign material for the entire report
@@ -137,6 +141,32 @@ def parse_parts(file_content, material, thickness):
 
     return parts_data
 
+def parse_report(file_content):
+    """
+    Parses the Sub Nests and Parts in Order tables of a single Metallix AutoNest report.
+    Args:
+        file_content (str): The content of a single uploaded report.
+
+    Returns:
+        dict: Data for Sub Nests, Parts in Order of the report
+    """
+    # Parse Sub Nests from the report
+    # parsed_sub_nests returns a list of dictionaries
+    sub_nests = parse_sub_nests(file_content)
+
+    # Extract material and thickness from the first row of sub_nests
+    material = sub_nests[0]["Material"]
+    thickness = sub_nests[0]["Thickness (mm)"]
+
+    # Parse Parts from the report
+    # parsed_parts returns a list of dictionaries
+    parts = parse_parts(file_content, material, thickness)
+
+    return {
+        "sub_nests": sub_nests,
+        "parts": parts
+    }
+
 def parse_multiple_reports(file_contents):
     """
     Parses and combines data from multiple Metallix AutoNest reports.
@@ -154,18 +184,77 @@ def parse_multiple_reports(file_contents):
     }
 
     for content in file_contents:
-        # Parse Sub Nests from the current report and add to combined data        
-        # parsed_sub_nests returns a list of dictionaries
-        sub_nests = parse_sub_nests(content)
-        combined_data["sub_nests"].extend(sub_nests)
+        # Parse the current report and add its rows to combined data
+        report_data = parse_report(content)
+        combined_data["sub_nests"].extend(report_data["sub_nests"])
+        combined_data["parts"].extend(report_data["parts"])
 
-        # Extract material and thickness from the first row of sub_nests
-        material = sub_nests[0]["Material"]
-        thickness = sub_nests[0]["Thickness (mm)"]
+    return combined_data
 
-        # Parse Parts from the current report and add to combined data
-        # parsed_parts returns a list of dictionaries
-        parts = parse_parts(content, material, thickness)
-        combined_data["parts"].extend(parts)
+# Columns that identify the same part across reports
+# All columns except the quantities, so merged rows never hide a different weight or cutting time
+PART_KEY_COLUMNS = ("Part Name", "Material", "Thickness (mm)", "Weight (kg)", "Cutting Time (sec)")
 
-    return combined_data
\ No newline at end of file
+# Columns that identify the same sub nest layout across reports
+# All columns except Plate# and Quantity, so merged rows never hide a different weight or area
+SUB_NEST_KEY_COLUMNS = (
+    "Sheet Size X (mm)", "Sheet Size Y (mm)", "Material", "Thickness (mm)",
+    "Area (m²)", "Weight (kg)", "Cutting Time (1 sheet)"
+)
+
+def consolidate_rows(rows, key_columns, quantity_columns):
+    """
+    Merges identical rows into a single row and sums their quantities.
+
+    Rows are indexed in a dictionary by the values of key_columns, so every row is
+    visited only once (O(n)). The first occurrence of a key keeps its position and all
+    other columns; only the quantity columns are accumulated.
+
+    Args:
+        rows (list[dict]): Parsed rows (e.g. combined_data["parts"]).
+        key_columns (tuple[str]): Column names that identify identical rows.
+        quantity_columns (tuple[str]): Column names holding the quantities to sum.
+
+    Returns:
+        list[dict]: Consolidated rows in order of first occurrence.
+
+    Example:
+        >>> consolidate_rows(
+        ...     [{"Part Name": "A", "Material": "Mild Steel", "Thickness (mm)": 5.0, "Ordered Qty": 2},
+        ...      {"Part Name": "A", "Material": "Mild Steel", "Thickness (mm)": 5.0, "Ordered Qty": 3}],
+        ...     ("Part Name", "Material", "Thickness (mm)"), ("Ordered Qty",))
+        [{'Part Name': 'A', 'Material': 'Mild Steel', 'Thickness (mm)': 5.0, 'Ordered Qty': 5}]
+    """
+    consolidated = {} # Key tuple -> consolidated row (dicts keep insertion order)
+    for row in rows:
+        key = tuple(row[column] for column in key_columns)
+        existing_row = consolidated.get(key)
+        if existing_row is None:
+            consolidated[key] = dict(row) # Copy so the parsed rows are not modified
+        else:
+            for column in quantity_columns:
+                existing_row[column] += row[column]
+
+    return list(consolidated.values())
+
+def consolidate_order(combined_data):
+    """
+    Merges identical parts and identical sub nest layouts from multiple reports.
+
+    The same .DFT part (same weight and cutting time) nested in several reports, or
+    repeated sub nests with the same sheet size, material, thickness, area, weight and
+    cutting time, are merged into one row with the summed quantities (and the Plate# of
+    the first row). Rows that differ in any other column are kept separate.
+    This reduces the number of rows that have to be priced and the number of items
+    submitted to Bubble.
+
+    Args:
+        combined_data (dict): Combined data returned by parse_multiple_reports().
+
+    Returns:
+        dict: Consolidated data with the same "sub_nests" and "parts" structure.
+    """
+    return {
+        "sub_nests": consolidate_rows(combined_data["sub_nests"], SUB_NEST_KEY_COLUMNS, ("Quantity",)),
+        "parts": consolidate_rows(combined_data["parts"], PART_KEY_COLUMNS, ("Ordered Qty", "Placed Qty"))
+    }
@@ -0,0 +1,313 @@
+import hashlib
+
+import pandas as pd
+
+from parsers import parse_report, consolidate_order, PART_KEY_COLUMNS, SUB_NEST_KEY_COLUMNS
+from calculations import check_material_prices, price_sub_nests, price_parts
+from analytics import calculate_material_utilization, add_sub_nest_utilization
+
+# Tables of a revision with the columns that identify a consolidated row and the function that prices it
+TABLES = {
+    "sub_nests": (SUB_NEST_KEY_COLUMNS, price_sub_nests),
+    "parts": (PART_KEY_COLUMNS, price_parts)
+}
+
+# Columns that identify a row within one report, so a resent report is compared row by row
+REPORT_ROW_KEY_COLUMNS = {
+    "sub_nests": ("Plate#",),
+    "parts": ("Part Name",)
+}
+
+# Columns that describe a row in the price delta
+ITEM_COLUMNS = {
+    "sub_nests": ("Plate#", "Sheet Size X (mm)", "Sheet Size Y (mm)", "Material", "Thickness (mm)"),
+    "parts": ("Part Name", "Material", "Thickness (mm)")
+}
+
+def fingerprint_report(file_content):
+    """
+    Returns a fingerprint of the content of a single report.
+
+    Args:
+        file_content (str): The content of a single uploaded report.
+
+    Returns:
+        str: SHA-256 hex digest of the report content.
+    """
+    return hashlib.sha256(file_content.encode("utf-8")).hexdigest()
+
+def fingerprint_row(row):
+    """
+    Returns a fingerprint of a parsed row (all columns and values).
+
+    Args:
+        row (dict): A parsed row of the Sub Nests or Parts in Order table.
+
+    Returns:
+        str: SHA-256 hex digest of the row.
+    """
+    return hashlib.sha256(repr(tuple(row.items())).encode("utf-8")).hexdigest()
+
+def index_rows(rows, key_columns, report_names=None):
+    """
+    Indexes rows by their identity so the same row can be found in another revision.
+
+    Without report_names the rows must be consolidated (unique by key_columns)
+    and the key is the values of key_columns.
+    With report_names (one per row) the key is
+    (report name, values of key_columns, occurrence number in that report).
+    The report name (uploaded file name) stays the same when a report is resent with
+    changes, so its rows are compared one by one, and removing one report does not
+    change the keys of the rows of other reports.
+
+    Args:
+        rows (list[dict]): Parsed rows (e.g. combined_data["parts"]).
+        key_columns (tuple[str]): Column names that identify a row.
+        report_names (list[str], optional): Name of the report of each row.
+
+    Returns:
+        dict: Row key (tuple) -> row (dict), in order of the rows.
+    """
+    if report_names is None:
+        return {tuple(row[column] for column in key_columns): row for row in rows}
+
+    indexed_rows = {}
+    occurrences = {} # (Report name, identity) -> number of rows seen with that identity
+    for report_name, row in zip(report_names, rows):
+        identity = (report_name,) + tuple(row[column] for column in key_columns)
+        occurrence = occurrences.get(identity, 0)
+        occurrences[identity] = occurrence + 1
+        indexed_rows[identity + (occurrence,)] = row
+
+    return indexed_rows
+
+def build_revision(reports, previous_revision=None, consolidate=False):
+    """
+    Builds a revision of an order from the uploaded reports.
+
+    Every report is fingerprinted, and reports already parsed in the previous revision
+    are reused instead of being parsed again.
+
+    Args:
+        reports (list of tuple): (report name, report content) of every uploaded report.
+                                 The name (e.g. the uploaded file name) identifies the report
+                                 across revisions of the order.
+        previous_revision (dict, optional): Previous revision of the same order.
+        consolidate (bool): Merge identical parts and sub nests (see parsers.consolidate_order).
+
+    Returns:
+        dict: Revision of the order, containing:
+            - "reports": Report fingerprint -> parsed report data.
+            - "report_fingerprints": Report name -> report fingerprint.
+            - "consolidated": True if identical rows were merged.
+            - "sub_nests", "parts": Row key -> parsed row (see index_rows).
+            - "row_fingerprints": Fingerprints of the rows of each table by row key.
+            - "priced": Priced rows of each table by row key (filled by price_revision).
+            - "pricing_inputs": Prices used by price_revision.
+    """
+    previous_reports = previous_revision["reports"] if previous_revision else {}
+
+    parsed_reports = {}
+    report_fingerprints = {}
+    combined_data = {"sub_nests": [], "parts": []}
+    row_reports = {"sub_nests": [], "parts": []} # Report name of every combined row
+    for report_name, content in reports:
+        report_fingerprint = fingerprint_report(content)
+        report_data = parsed_reports.get(report_fingerprint) or previous_reports.get(report_fingerprint)
+        if report_data is None:
+            report_data = parse_report(content)
+        parsed_reports[report_fingerprint] = report_data
+        report_fingerprints[report_name] = report_fingerprint
+
+        for table in TABLES:
+            combined_data[table].extend(report_data[table])
+            row_reports[table].extend([report_name] * len(report_data[table]))
+
+    revision = {
+        "reports": parsed_reports,
+        "report_fingerprints": report_fingerprints,
+        "consolidated": consolidate,
+        "row_fingerprints": {},
+        "priced": None,
+        "pricing_inputs": None
+    }
+
+    if consolidate:
+        # Consolidated rows are unique by their key columns and no longer belong to one report
+        combined_data = consolidate_order(combined_data)
+        for table, (key_columns, _) in TABLES.items():
+            revision[table] = index_rows(combined_data[table], key_columns)
+    else:
+        for table in TABLES:
+            revision[table] = index_rows(combined_data[table], REPORT_ROW_KEY_COLUMNS[table], row_reports[table])
+
+    for table in TABLES:
+        revision["row_fingerprints"][table] = {
+            key: fingerprint_row(row) for key, row in revision[table].items()
+        }
+
+    return revision
+
+def is_same_order(old_revision, new_revision):
+    """
+    Checks if a revision is a new revision of the previous order,
+    i.e. at least one report name is uploaded again (its content may have changed).
+
+    Args:
+        old_revision (dict): Previous revision (see build_revision).
+        new_revision (dict): New revision (see build_revision).
+
+    Returns:
+        bool: True if the revisions share a report name.
+    """
+    return bool(set(old_revision["report_fingerprints"]) & set(new_revision["report_fingerprints"]))
+
+def diff_revisions(old_revision, new_revision):
+    """
+    Compares two revisions of an order.
+
+    Args:
+        old_revision (dict): Previous revision (see build_revision).
+        new_revision (dict): New revision (see build_revision).
+
+    Returns:
+        dict: For "reports": lists of "added", "removed" and "changed" report names.
+              For "sub_nests" and "parts": lists of "added", "removed" and "changed" row keys.
+    """
+    old_reports = old_revision["report_fingerprints"]
+    new_reports = new_revision["report_fingerprints"]
+    diff = {
+        "reports": {
+            "added": [name for name in new_reports if name not in old_reports],
+            "removed": [name for name in old_reports if name not in new_reports],
+            "changed": [name for name, fingerprint in new_reports.items() if name in old_reports and old_reports[name] != fingerprint]
+        }
+    }
+    for table in TABLES:
+        old_fingerprints = old_revision["row_fingerprints"][table]
+        new_fingerprints = new_revision["row_fingerprints"][table]
+        diff[table] = {
+            "added": [key for key in new_fingerprints if key not in old_fingerprints],
+            "removed": [key for key in old_fingerprints if key not in new_fingerprints],
+            "changed": [
+                key for key, fingerprint in new_fingerprints.items()
+                if key in old_fingerprints and old_fingerprints[key] != fingerprint
+            ]
+        }
+
+    return diff
+
+def price_revision(revision, material_prices, cutting_price_per_sec, previous_revision=None):
+    """
+    Calculates prices for a revision, recomputing only rows that changed.
+
+    If the previous revision was priced with the same material and cutting prices,
+    its priced rows are reused and only added or changed rows are priced.
+    Otherwise every row is priced again.
+    The priced rows are stored in revision["priced"].
+
+    Args:
+        revision (dict): Revision to price (see build_revision).
+        material_prices (dict): Material prices per kilogram for each material name.
+        cutting_price_per_sec (float): Cutting price per second (single value).
+        previous_revision (dict, optional): Previous priced revision of the same order.
+
+    Returns:
+        dict: Same results as calculations.calculate_order():
+            - "sub_nests_with_calcs_df": DataFrame with calculated fields for sub nests.
+            - "parts_with_calcs_df": DataFrame with calculated fields for parts.
+            - "material_utilization_df": DataFrame with sheet utilization per material and thickness.
+    """
+    pricing_inputs = (tuple(sorted(material_prices.items())), cutting_price_per_sec)
+    reuse_prices = (
+        previous_revision is not None
+        and previous_revision["priced"] is not None
+        and previous_revision["pricing_inputs"] == pricing_inputs
+    )
+    diff = diff_revisions(previous_revision, revision) if reuse_prices else None
+
+    priced = {}
+    for table, (_, price_rows) in TABLES.items():
+        if reuse_prices:
+            keys_to_price = diff[table]["added"] + diff[table]["changed"]
+        else:
+            keys_to_price = list(revision[table])
+
+        priced_rows = {}
+        if keys_to_price:
+            rows_df = pd.DataFrame([revision[table][key] for key in keys_to_price])
+            check_material_prices(rows_df["Material"], material_prices)
+            rows_df = price_rows(rows_df, material_prices, cutting_price_per_sec)
+            priced_rows = dict(zip(keys_to_price, rows_df.to_dict("records")))
+
+        # Keep the order of the new revision, unchanged rows come from the previous revision
+        priced[table] = {
+            key: priced_rows[key] if key in priced_rows else previous_revision["priced"][table][key]
+            for key in revision[table]
+        }
+
+    revision["priced"] = priced
+    revision["pricing_inputs"] = pricing_inputs
+
+    sub_nests_df = pd.DataFrame(list(priced["sub_nests"].values()))
+    parts_df = pd.DataFrame(list(priced["parts"].values()))
+
+    # Utilization depends on all rows of a material, so it is calculated for the whole order
+    material_utilization_df = calculate_material_utilization(sub_nests_df, parts_df)
+    sub_nests_df = add_sub_nest_utilization(sub_nests_df, material_utilization_df)
+
+    return {
+        "sub_nests_with_calcs_df": sub_nests_df,
+        "parts_with_calcs_df": parts_df,
+        "material_utilization_df": material_utilization_df
+    }
+
+def price_delta(old_revision, new_revision):
+    """
+    Lists the price changes between two priced revisions of an order.
+
+    Args:
+        old_revision (dict): Previous priced revision.
+        new_revision (dict): New priced revision.
+
+    Returns:
+        tuple: (delta_df, totals)
+            - delta_df (pd.DataFrame): One row per added, removed or changed sub nest or part with
+              its old price, new price and price delta.
+            - totals (dict): "sub_nests" and "parts" -> total price delta of the whole table
+              (includes repricing of unchanged rows if the prices were changed).
+    """
+    diff = diff_revisions(old_revision, new_revision)
+
+    delta_rows = []
+    totals = {}
+    for table, label in (("sub_nests", "Sub Nest"), ("parts", "Part")):
+        old_priced = old_revision["priced"][table]
+        new_priced = new_revision["priced"][table]
+        for change in ("added", "removed", "changed"):
+            for key in diff[table][change]:
+                old_price = old_priced[key]["Total Price (€)"] if key in old_priced else 0.0
+                new_price = new_priced[key]["Total Price (€)"] if key in new_priced else 0.0
+                row_revision = new_revision if key in new_priced else old_revision
+                row = row_revision["priced"][table][key]
+                delta_rows.append({
+                    "Table": label,
+                    "Change": change,
+                    "Report": "" if row_revision["consolidated"] else key[0], # Consolidated rows have no report
+                    "Item": " / ".join(str(row[column]) for column in ITEM_COLUMNS[table]),
+                    "Old Price (€)": old_price,
+                    "New Price (€)": new_price,
+                    "Price Delta (€)": round(new_price - old_price, 2)
+                })
+
+        totals[table] = round(
+            sum(row["Total Price (€)"] for row in new_priced.values())
+            - sum(row["Total Price (€)"] for row in old_priced.values()),
+            2
+        )
+
+    delta_df = pd.DataFrame(
+        delta_rows,
+        columns=["Table", "Change", "Report", "Item", "Old Price (€)", "New Price (€)", "Price Delta (€)"]
+    )
+    return delta_df, totals
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from analytics import calculate_material_utilization, add_sub_nest_utilization, save_order_utilization, aggregate_order_history
+
+def make_order():
+    sub_nests_df = pd.DataFrame([
+        {"Material": "Mild Steel", "Thickness (mm)": 4.2, "Quantity": 2, "Weight (kg)": 100.0}
+    ])
+    parts_df = pd.DataFrame([
+        {"Material": "Mild Steel", "Thickness (mm)": 4.2, "Ordered Qty": 10, "Placed Qty": 6, "Weight (kg)": 20.0}
+    ])
+    return sub_nests_df, parts_df
+
+def test_utilization_uses_placed_quantity():
+    utilization_df = calculate_material_utilization(*make_order())
+
+    assert utilization_df["Part Weight (kg)"].tolist() == [120.0]
+    assert utilization_df["Scrap Weight (kg)"].tolist() == [80.0]
+    assert utilization_df["Weight Utilization (%)"].tolist() == [60.0]
+
+def test_saving_an_order_twice_replaces_its_rows(tmp_path):
+    history_path = tmp_path / "order_history.csv"
+    utilization_df = calculate_material_utilization(*make_order())
+
+    save_order_utilization(utilization_df, "0123", history_path)
+    save_order_utilization(utilization_df, "0123", history_path)
+    save_order_utilization(utilization_df, "abcd", history_path)
+
+    aggregated_df = aggregate_order_history(history_path)
+    assert aggregated_df["Sheet Weight (kg)"].tolist() == [400.0]
+    assert sorted(aggregate_order_history(history_path, ("Order",))["Order"]) == ["0123", "abcd"]
+
+def test_saving_a_revised_order_counts_it_once(tmp_path):
+    history_path = tmp_path / "order_history.csv"
+    sub_nests_df, parts_df = make_order()
+    save_order_utilization(calculate_material_utilization(sub_nests_df, parts_df), "Q-1001", history_path)
+
+    # Revised order: one more sheet and more placed parts
+    sub_nests_df["Quantity"] = 3
+    parts_df["Placed Qty"] = 9
+    save_order_utilization(calculate_material_utilization(sub_nests_df, parts_df), "Q-1001", history_path)
+
+    aggregated_df = aggregate_order_history(history_path, ("Order",))
+    assert aggregated_df["Order"].tolist() == ["Q-1001"]
+    assert aggregated_df["Sheets"].tolist() == [3]
+    assert aggregated_df["Sheet Weight (kg)"].tolist() == [300.0]
+    assert aggregated_df["Part Weight (kg)"].tolist() == [180.0]
+
+def test_sub_nest_scrap_uses_material_utilization():
+    sub_nests_df, parts_df = make_order()
+    sub_nests_df["Total Weight (kg)"] = sub_nests_df["Weight (kg)"] * sub_nests_df["Quantity"]
+    sub_nests_df["Total Material Price (€)"] = sub_nests_df["Total Weight (kg)"] * 0.3
+
+    sub_nests_df = add_sub_nest_utilization(sub_nests_df, calculate_material_utilization(sub_nests_df, parts_df))
+
+    assert sub_nests_df["Weight Utilization (%)"].tolist() == [60.0]
+    assert sub_nests_df["Scrap Weight (kg)"].tolist() == [80.0]
+    assert sub_nests_df["Scrap Material Price (€)"].tolist() == [24.0]
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from durations import parse_hhmmss, parse_hhmmss_array, format_hhmmss, InvalidDurationError
+
+def test_fixed_width_values():
+    values = ["00:00:00", "00:48:08", "01:00:00", "99:59:59"]
+
+    assert parse_hhmmss_array(values).tolist() == [0, 2888, 3600, 99 * 3600 + 59 * 60 + 59]
+    assert [parse_hhmmss(value) for value in values] == parse_hhmmss_array(values).tolist()
+
+def test_short_long_and_padded_values():
+    values = pd.Series(["5:30", "7", "0:0:5", "123:00:01", " 00:48:08", "00:48:08 ", "\t01:00:00\n"])
+
+    result = parse_hhmmss_array(values)
+
+    assert result.dtype == np.int64
+    assert result.tolist() == [330, 7, 5, 123 * 3600 + 1, 2888, 2888, 3600]
+
+def test_mixed_column_keeps_row_order():
+    result = parse_hhmmss_array(["00:00:26", "123:00:00", "00:00:32"])
+
+    assert result.tolist() == [26, 123 * 3600, 32]
+
+@pytest.mark.parametrize("value", ["", ":", "ab:cd:ef", "00:00:6x", "00:60:00", "00:00:60", "1:2:3:4", "00-48-08", "-1:00:00"])
+def test_invalid_values_raise(value):
+    with pytest.raises(InvalidDurationError):
+        parse_hhmmss_array(["00:00:26", value])
+    with pytest.raises(InvalidDurationError):
+        parse_hhmmss(value)
+
+def test_empty_column():
+    result = parse_hhmmss_array(pd.Series([], dtype=str))
+
+    assert result.dtype == np.int64
+    assert result.shape == (0,)
+
+def test_format_hhmmss():
+    assert format_hhmmss(0) == "00:00:00"
+    assert format_hhmmss(np.int64(2888)) == "00:48:08"
+    assert format_hhmmss(123 * 3600 + 61) == "123:01:01"
@@ -0,0 +1,49 @@
+from parsers import consolidate_order
+
+def make_part(weight, ordered_qty, cutting_time_sec=26):
+    return {
+        "Part Name": "P1",
+        "Ordered Qty": ordered_qty,
+        "Placed Qty": ordered_qty,
+        "Weight (kg)": weight,
+        "Cutting Time (sec)": cutting_time_sec,
+        "Material": "Mild Steel",
+        "Thickness (mm)": 4.2
+    }
+
+def make_sub_nest(plate, quantity, area=4.5):
+    return {
+        "Plate#": plate,
+        "Sheet Size X (mm)": 3000,
+        "Sheet Size Y (mm)": 1500,
+        "Material": "Mild Steel",
+        "Thickness (mm)": 4.2,
+        "Quantity": quantity,
+        "Area (m²)": area,
+        "Weight (kg)": 148.365,
+        "Cutting Time (1 sheet)": "00:48:08"
+    }
+
+def test_identical_rows_are_merged_and_quantities_summed():
+    combined_data = {
+        "sub_nests": [make_sub_nest(1, 6), make_sub_nest(1, 2)],
+        "parts": [make_part(50.0, 2), make_part(50.0, 1)]
+    }
+
+    consolidated = consolidate_order(combined_data)
+
+    assert [row["Quantity"] for row in consolidated["sub_nests"]] == [8]
+    assert [(row["Ordered Qty"], row["Placed Qty"]) for row in consolidated["parts"]] == [(3, 3)]
+    # The parsed rows are not modified
+    assert combined_data["parts"][0]["Ordered Qty"] == 2
+
+def test_rows_with_different_weight_time_or_area_are_kept_separate():
+    combined_data = {
+        "sub_nests": [make_sub_nest(1, 6), make_sub_nest(2, 1, area=3.5)],
+        "parts": [make_part(50.0, 2), make_part(30.0, 1), make_part(50.0, 1, cutting_time_sec=40)]
+    }
+
+    consolidated = consolidate_order(combined_data)
+
+    assert [row["Area (m²)"] for row in consolidated["sub_nests"]] == [4.5, 3.5]
+    assert [(row["Weight (kg)"], row["Ordered Qty"]) for row in consolidated["parts"]] == [(50.0, 2), (30.0, 1), (50.0, 1)]
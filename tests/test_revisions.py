@@ -0,0 +1,74 @@
+from revisions import build_revision, diff_revisions, is_same_order, price_revision, price_delta
+
+MATERIAL_PRICES = {"Mild Steel": 0.3}
+CUTTING_PRICE_PER_SEC = 0.05
+
+def make_report(plate_qty, part_qty, part_weight):
+    """Minimal Metallix AutoNest report with one sub nest and the part P1."""
+    return (
+        "Sub Nests in Order:\n"
+        "|Plate#  |Size X      |Size Y     |Material    |Thickness |Qty     |Area      |Weight    |Efficiency |\n"
+        f"|1       |3000        |1500       |Mild Steel  |4.2       |{plate_qty}       |4.50      |148.365   |00:48:08    |\n"
+        "Parts in Order:\n"
+        "|Name                          |Ordered Qty  |Placed Qty |Weight    |Cut Time |\n"
+        f"|T:\\ORDER\\P1.DFT                |{part_qty}            |{part_qty}          |{part_weight}      |00:00:26 |\n"
+    )
+
+def test_removing_a_report_only_removes_its_rows():
+    report_a = make_report(plate_qty=6, part_qty=2, part_weight=50.0)
+    report_b = make_report(plate_qty=1, part_qty=1, part_weight=30.0)
+
+    old_revision = build_revision([("a.txt", report_a), ("b.txt", report_b)])
+    price_revision(old_revision, MATERIAL_PRICES, CUTTING_PRICE_PER_SEC)
+    new_revision = build_revision([("b.txt", report_b)], old_revision)
+    price_revision(new_revision, MATERIAL_PRICES, CUTTING_PRICE_PER_SEC, old_revision)
+
+    diff = diff_revisions(old_revision, new_revision)
+    for table in ("sub_nests", "parts"):
+        assert diff[table]["added"] == []
+        assert diff[table]["changed"] == []
+        assert len(diff[table]["removed"]) == 1
+
+    # Report B's rows are reused from the previous revision, not repriced
+    for table in ("sub_nests", "parts"):
+        for key, row in new_revision["priced"][table].items():
+            assert row is old_revision["priced"][table][key]
+
+    # Only report A's part is reported as removed, with its own price
+    delta_df, _ = price_delta(old_revision, new_revision)
+    parts_delta = delta_df[delta_df["Table"] == "Part"]
+    assert parts_delta["Change"].tolist() == ["removed"]
+    assert parts_delta["Report"].tolist() == ["a.txt"]
+    assert parts_delta["Old Price (€)"].tolist() == [round(2 * (50.0 * 0.3 + 26 * 0.05), 2)]
+
+def test_resent_report_with_changed_quantity_is_diffed_row_by_row():
+    old_revision = build_revision([
+        ("a.txt", make_report(plate_qty=6, part_qty=2, part_weight=50.0)),
+        ("b.txt", make_report(plate_qty=1, part_qty=1, part_weight=30.0))
+    ])
+    price_revision(old_revision, MATERIAL_PRICES, CUTTING_PRICE_PER_SEC)
+    new_revision = build_revision([
+        ("a.txt", make_report(plate_qty=6, part_qty=3, part_weight=50.0)),
+        ("b.txt", make_report(plate_qty=1, part_qty=1, part_weight=30.0))
+    ], old_revision)
+    price_revision(new_revision, MATERIAL_PRICES, CUTTING_PRICE_PER_SEC, old_revision)
+
+    assert is_same_order(old_revision, new_revision)
+    diff = diff_revisions(old_revision, new_revision)
+    assert diff["reports"]["changed"] == ["a.txt"]
+    assert diff["sub_nests"] == {"added": [], "removed": [], "changed": []}
+    assert diff["parts"]["added"] == []
+    assert diff["parts"]["removed"] == []
+    assert diff["parts"]["changed"] == [("a.txt", "P1", 0)]
+
+    delta_df, totals = price_delta(old_revision, new_revision)
+    price_per_part = 50.0 * 0.3 + 26 * 0.05
+    assert delta_df["Change"].tolist() == ["changed"]
+    assert delta_df["Price Delta (€)"].tolist() == [round(3 * price_per_part - 2 * price_per_part, 2)]
+    assert totals["sub_nests"] == 0
+
+def test_consolidated_rows_are_keyed_by_identity():
+    report_a = make_report(plate_qty=6, part_qty=2, part_weight=50.0)
+    revision = build_revision([("a.txt", report_a)], consolidate=True)
+
+    assert list(revision["parts"]) == [("P1", "Mild Steel", 4.2, 50.0, 26)]
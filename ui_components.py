@@ -1,4 +1,5 @@
 import streamlit as st
+from durations import format_hhmmss
 
 def display_table(df, title):
     """
@@ -27,7 +28,7 @@ def display_summary(total_weight, total_material_price, total_cutting_time_sec,
         total_price (float): Total price.
     """
     # Convert total_cutting_time_sec to HH:MM:SS format
-    total_cutting_time = f"{total_cutting_time_sec // 3600:02}:{(total_cutting_time_sec % 3600) // 60:02}:{total_cutting_time_sec % 60:02}"
+    total_cutting_time = format_hhmmss(total_cutting_time_sec)
 
     # Display the summary
     st.write(f"**Total Material Weight:** {total_weight:.2f} kg")
@@ -38,3 +39,21 @@ def display_summary(total_weight, total_material_price, total_cutting_time_sec,
         f"<h3 style='color:green;'>Total Price: €{total_price:.2f}</h3>",
         unsafe_allow_html=True
     )
+
+def display_price_delta(delta_df, totals):
+    """
+    Displays the price changes compared to the previous revision of the order.
+
+    Args:
+        delta_df (pd.DataFrame): Added, removed and changed rows with their price delta.
+        totals (dict): Total price delta for "sub_nests" and "parts".
+    """
+    st.subheader("Changes Since Previous Revision")
+
+    if delta_df.empty:
+        st.write("No sub nests or parts changed.")
+    else:
+        display_table(delta_df, "Changed Sub Nests and Parts")
+
+    st.write(f"**Sub Nests Price Delta:** €{totals['sub_nests']:+.2f}")
+    st.write(f"**Parts Price Delta:** €{totals['parts']:+.2f}")